@@ -1,120 +1,259 @@
 #!/usr/bin/env python3
 """Extract LinkedIn posts from saved HTML using stable patterns (URLs, data attributes)."""
 
-import re
+import os
 import json
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from html.parser import HTMLParser
 from html import unescape
 
+try:
+    import re2 as re  # Optional: RE2 engine, no backtracking
+except ImportError:
+    import re
+
 HTML_FILE = Path(__file__).parent.parent / "scraped" / "linkedin-page.html"
 OUTPUT_FILE = Path(__file__).parent.parent / "scraped" / "extracted-posts.json"
 
 
-def extract_posts(html: str) -> list[dict]:
-    """Extract posts using regex on stable patterns."""
-    posts = []
-    
-    # Extract article/pulse URLs with titles
-    # Pattern: href="...linkedin.com/pulse/SLUG..." followed by title
-    pulse_pattern = r'href="(https://www\.linkedin\.com/pulse/([^"]+))"[^>]*>.*?<p[^>]*>([^<]+)</p>'
-    
-    for match in re.finditer(pulse_pattern, html, re.DOTALL):
-        url, slug, title = match.groups()
-        title = unescape(title.strip())
-        if title and len(title) > 5:
-            posts.append({
+PULSE_PREFIX = "https://www.linkedin.com/pulse/"
+NEWSLETTER_PREFIX = "https://www.linkedin.com/newsletters/"
+COMPANY_PREFIX = "https://www.linkedin.com/company/"
+PROFILE_PREFIX = "https://www.linkedin.com/in/"
+HASHTAG_MARKER = "keywords=%23"
+HASHTAGS = ("openclaw", "clawdbot", "moltbot")
+HASHTAG_MAX_LEN = max(len(hashtag) for hashtag in HASHTAGS)
+# Characters after a pulse anchor in which its title <p> must start
+PULSE_TITLE_WINDOW = 2048
+# Cheap substring checks: if none occur, there is nothing to extract
+EXTRACT_MARKERS = (
+    "linkedin.com/pulse/",
+    "/newsletters/",
+    "/company/",
+    "/in/",
+    "expandable-text-box",
+    HASHTAG_MARKER,
+)
+
+_PROFILE_LINK_RE = re.compile(r'href="(https://www\.linkedin\.com/in/([^/"]{1,200})/)"')
+# Name is the first text after the closing </a> and the next opening tag.
+# A single pattern ending in [^<]*([^<]+) backtracked to a one-character name.
+_PROFILE_NAME_RE = re.compile(r'[^>]*>[^<]*</a>[^<]*<[^>]*>([^<]+)')
+# Characters after a profile link searched for the name
+PROFILE_NAME_WINDOW = 2048
+
+
+def _single_segment(rest: str) -> str:
+    """Return SLUG for a 'SLUG/' href tail, or '' if it has more segments."""
+    if rest.endswith("/") and "/" not in rest[:-1]:
+        return rest[:-1]
+    return ""
+
+
+class LinkedInExtractor(HTMLParser):
+    """Collect posts, profiles, hashtags and snippets in a single pass over the HTML."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.articles = []
+        self._seen_articles = set()
+        self.newsletters = []
+        self.companies = set()
+        self.profiles = set()
+        self.hashtags = set()
+        self.snippets = []
+        # End of the previous chunk, so a hashtag split across feed() calls is found
+        self._hashtag_tail = ""
+        # Pulse anchor waiting for the <p> that carries its title
+        self._pending_anchor_url = None
+        self._pending_budget = 0
+        self._in_title = False
+        self._title_parts = []
+        # Inside data-testid="expandable-text-box"
+        self._in_textbox = False
+        self._textbox_parts = []
+
+    def feed(self, data):
+        self._scan_hashtags(data)
+        super().feed(data)
+
+    def handle_starttag(self, tag, attrs):
+        if self._in_textbox:
+            if tag == "br":
+                self._textbox_parts.append(" ")
+                return
+            self._end_textbox()
+        if self._in_title:
+            # Title must be plain text directly inside <p>; try the next one
+            self._in_title = False
+        if self._pending_anchor_url:
+            self._pending_budget -= len(self.get_starttag_text() or "")
+            if self._pending_budget < 0:
+                # No title close enough to the anchor; don't claim a later <p>
+                self._pending_anchor_url = None
+
+        attrs = dict(attrs)
+        href = attrs.get("href")
+        if href:
+            self._handle_href(href)
+
+        if attrs.get("data-testid") == "expandable-text-box":
+            self._in_textbox = True
+            self._textbox_parts = []
+        elif tag == "p" and self._pending_anchor_url:
+            self._in_title = True
+            self._title_parts = []
+
+    def handle_endtag(self, tag):
+        if self._pending_anchor_url:
+            self._pending_budget -= len(tag) + 3
+        if self._in_textbox:
+            self._end_textbox()
+        if self._in_title:
+            self._in_title = False
+            if tag == "p":
+                self._end_title()
+
+    def handle_data(self, data):
+        if self._pending_anchor_url:
+            self._pending_budget -= len(data)
+        if self._in_textbox:
+            self._textbox_parts.append(data)
+        elif self._in_title:
+            self._title_parts.append(data)
+
+    def close(self):
+        super().close()
+        if self._in_textbox:
+            self._end_textbox()
+
+    def results(self) -> dict:
+        """Return the extracted data."""
+        return {
+            "articles": self.articles,
+            "newsletters": self.newsletters,
+            "companies": [
+                {"type": "company", "url": url, "slug": slug}
+                for url, slug in self.companies
+            ],
+            "profiles": [{"url": u, "username": n} for u, n in self.profiles],
+            "hashtags": list(self.hashtags),
+            "snippets": self.snippets[:20]  # First 20 unique snippets
+        }
+
+    def _handle_href(self, href: str):
+        if href.startswith(PULSE_PREFIX):
+            slug = href[len(PULSE_PREFIX):]
+            # The most recent anchor claims the next title within the window
+            if slug:
+                self._pending_anchor_url = (href, slug)
+                self._pending_budget = PULSE_TITLE_WINDOW
+        elif href.startswith(NEWSLETTER_PREFIX):
+            slug = href[len(NEWSLETTER_PREFIX):]
+            if slug:
+                self.newsletters.append({
+                    "type": "newsletter",
+                    "url": href,
+                    "slug": slug
+                })
+        elif href.startswith(COMPANY_PREFIX):
+            slug = _single_segment(href[len(COMPANY_PREFIX):])
+            if "openclaw" in slug.lower():
+                self.companies.add((href, slug))
+        elif href.startswith(PROFILE_PREFIX):
+            username = _single_segment(href[len(PROFILE_PREFIX):])
+            if username:
+                self.profiles.add((href, username))
+
+    def _scan_hashtags(self, data: str):
+        """Find keywords=%23<hashtag> anywhere in the raw text, including embedded JSON."""
+        text = self._hashtag_tail + data
+        self._hashtag_tail = text[-(len(HASHTAG_MARKER) + HASHTAG_MAX_LEN - 1):]
+        if "%23" not in text:
+            return
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # Lowercasing changed offsets; fall back to the lowered text
+            text = lowered
+        pos = lowered.find(HASHTAG_MARKER)
+        while pos >= 0:
+            pos += len(HASHTAG_MARKER)
+            for hashtag in HASHTAGS:
+                if lowered.startswith(hashtag, pos):
+                    self.hashtags.add(text[pos:pos + len(hashtag)])
+            pos = lowered.find(HASHTAG_MARKER, pos)
+
+    def _end_title(self):
+        raw = "".join(self._title_parts)
+        if not raw:
+            return
+        url, slug = self._pending_anchor_url
+        self._pending_anchor_url = None
+        title = raw.strip()
+        if title and len(title) > 5 and url not in self._seen_articles:
+            self._seen_articles.add(url)
+            article = {
                 "type": "article",
                 "url": url,
                 "slug": slug,
                 "title": title
-            })
-    
-    # Extract newsletter URLs
-    newsletter_pattern = r'href="(https://www\.linkedin\.com/newsletters/([^"]+))"'
-    for match in re.finditer(newsletter_pattern, html):
-        url, slug = match.groups()
-        posts.append({
-            "type": "newsletter", 
-            "url": url,
-            "slug": slug
-        })
-    
-    # Extract company page references
-    company_pattern = r'href="(https://www\.linkedin\.com/company/([^/"]+)/)"'
-    companies = set()
-    for match in re.finditer(company_pattern, html):
-        url, slug = match.groups()
-        if "openclaw" in slug.lower():
-            companies.add((url, slug))
-    
-    for url, slug in companies:
-        posts.append({
-            "type": "company",
-            "url": url,
-            "slug": slug
-        })
-    
-    # Extract profile URLs mentioned
-    profile_pattern = r'href="(https://www\.linkedin\.com/in/([^/"]+)/)"'
-    profiles = set()
-    for match in re.finditer(profile_pattern, html):
-        url, username = match.groups()
-        profiles.add((url, username))
-    
-    # Extract hashtag mentions
-    hashtag_pattern = r'keywords=%23(openclaw|clawdbot|moltbot)'
-    hashtags = set(re.findall(hashtag_pattern, html, re.I))
-    
-    # Extract text snippets containing "openclaw"
-    # Look for expandable-text-box content
-    text_box_pattern = r'data-testid="expandable-text-box">([^<]+(?:<br>)?[^<]*openclaw[^<]*)'
-    snippets = []
-    for match in re.finditer(text_box_pattern, html, re.I | re.DOTALL):
-        text = match.group(1)
-        text = re.sub(r'<[^>]+>', ' ', text)  # Strip HTML
-        text = unescape(text.strip())
-        text = re.sub(r'\s+', ' ', text)  # Normalize whitespace
-        if len(text) > 50:
-            snippets.append(text[:500])  # Truncate
-    
-    return {
-        "articles": [p for p in posts if p["type"] == "article"],
-        "newsletters": [p for p in posts if p["type"] == "newsletter"],
-        "companies": [p for p in posts if p["type"] == "company"],
-        "profiles": [{"url": u, "username": n} for u, n in profiles],
-        "hashtags": list(hashtags),
-        "snippets": snippets[:20]  # First 20 unique snippets
-    }
-
-
-def dedupe_articles(articles: list[dict]) -> list[dict]:
-    """Remove duplicate articles by URL."""
-    seen = set()
-    unique = []
-    for article in articles:
-        if article["url"] not in seen:
-            seen.add(article["url"])
-            # Extract author from slug (last part before ID)
-            slug_parts = article["slug"].rstrip("/").split("-")
+            }
             # Slug format: title-words-author-name-ID
-            # Author is typically 2nd-to-last group before the ID
+            # Author is typically the 2nd-to-last group before the random ID
+            slug_parts = slug.rstrip("/").split("-")
             if len(slug_parts) >= 3:
-                # Try to extract author name (usually before the random ID at end)
                 article["author_hint"] = "-".join(slug_parts[-3:-1]) if len(slug_parts) > 3 else slug_parts[-2]
-            unique.append(article)
-    return unique
+            self.articles.append(article)
+
+    def _end_textbox(self):
+        self._in_textbox = False
+        text = "".join(self._textbox_parts)
+        if "openclaw" in text.lower():
+            text = " ".join(text.split())  # Normalize whitespace
+            if len(text) > 50:
+                self.snippets.append(text[:500])  # Truncate
+
+
+def extract_posts(html: str) -> dict:
+    """Extract posts from stable patterns (URLs, data attributes) in one parse."""
+    extractor = LinkedInExtractor()
+    if any(marker in html for marker in EXTRACT_MARKERS):
+        extractor.feed(html)
+        extractor.close()
+    return extractor.results()
+
+
+def extract_posts_from_file(path: Path, chunk_size: int = 65536) -> dict:
+    """Extract posts from a saved HTML file, feeding the parser in chunks."""
+    extractor = LinkedInExtractor()
+    with path.open("r", encoding="utf-8") as f:
+        while chunk := f.read(chunk_size):
+            extractor.feed(chunk)
+    extractor.close()
+    return extractor.results()
+
+
+def batch_extract(html_files: list[Path]) -> list[dict]:
+    """Extract posts from several saved HTML files in parallel, one result per file."""
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        return list(executor.map(extract_posts_from_file, html_files, chunksize=4))
 
 
 def extract_author_profiles(html: str, articles: list[dict]) -> list[dict]:
     """Match article authors to their profile URLs."""
     # Map common author name patterns to profiles
     profile_map = {}
-    profile_pattern = r'href="(https://www\.linkedin\.com/in/([^/"]+)/)"[^>]*>[^<]*</a>[^<]*<[^>]*>[^<]*([^<]+)'
-    
-    for match in re.finditer(profile_pattern, html):
-        url, username, name = match.groups()
-        name = unescape(name.strip())
+    if "linkedin.com/in/" not in html:
+        return []
+    # Anchor on the link, then read the name from a bounded window after it
+    for match in _PROFILE_LINK_RE.finditer(html):
+        url, username = match.groups()
+        # Match on a slice: re2 re-encodes the whole str for pos/endpos arguments
+        name_match = _PROFILE_NAME_RE.match(html[match.end():match.end() + PROFILE_NAME_WINDOW])
+        if not name_match:
+            continue
+        name = unescape(name_match.group(1).strip())
         if name and len(name) > 2:
             profile_map[username.lower()] = {"url": url, "username": username, "name": name}
     
@@ -122,14 +261,8 @@ def extract_author_profiles(html: str, articles: list[dict]) -> list[dict]:
 
 
 if __name__ == "__main__":
-    print(f"Reading {HTML_FILE}...")
-    html = HTML_FILE.read_text(encoding="utf-8")
-    
-    print("Extracting data...")
-    data = extract_posts(html)
-    
-    # Dedupe
-    data["articles"] = dedupe_articles(data["articles"])
+    print(f"Extracting data from {HTML_FILE}...")
+    data = extract_posts_from_file(HTML_FILE)
     
     print(f"\nFound:")
     print(f"  - {len(data['articles'])} articles")
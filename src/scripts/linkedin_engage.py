@@ -15,16 +15,22 @@ import asyncio
 import json
 import random
 import time
-import hashlib
 from datetime import datetime, timedelta
+from html import unescape
 from pathlib import Path
 from typing import Optional
 
+try:
+    import orjson  # Optional: faster (de)serialization of state files
+except ImportError:
+    orjson = None
+
 # Paths
 PROJECT_ROOT = Path(__file__).parent.parent
 SCRAPED_DIR = PROJECT_ROOT / "scraped"
 DB_DIR = PROJECT_ROOT / "db"
 STATE_FILE = DB_DIR / "linkedin_state.json"
+EVENTS_FILE = DB_DIR / "linkedin_events.jsonl"
 COOKIES_FILE = PROJECT_ROOT / "config" / "linkedin_cookies.json"
 
 # Engagement settings
@@ -33,47 +39,127 @@ MIN_DELAY_MINUTES = 10
 MAX_DELAY_MINUTES = 25
 USED_DELAYS_FILE = DB_DIR / "used_delays.json"
 
+# Comment input differs between LinkedIn layouts; matched as one CSS selector list
+COMMENT_BOX_SELECTOR = ", ".join([
+    'div[data-placeholder="Add a comment…"]',
+    'div.ql-editor[contenteditable="true"]',
+    'div[role="textbox"][aria-label*="comment"]',
+    '.comments-comment-box__form textarea',
+    '.comments-comment-texteditor'
+])
+
+# Used delays are loaded once per session and written with the state
+_USED_DELAYS: Optional[dict[int, float]] = None
+_USED_DELAYS_CUTOFF = 0.0
+
+
+def dumps(obj, indent: bool = False) -> bytes:
+    """Serialize to JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0, default=str)
+    return json.dumps(obj, indent=2 if indent else None, default=str).encode()
+
+
+def loads(data: bytes):
+    """Parse JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 def load_state() -> dict:
-    """Load engagement state."""
+    """Load engagement state, replaying events from an interrupted session."""
     if STATE_FILE.exists():
-        return json.loads(STATE_FILE.read_text())
-    return {
-        "profiles": {},
-        "articles": {},
-        "comments_made": [],
-        "likes_made": [],
-        "last_run": None,
-        "comment_times": []
-    }
+        state = loads(STATE_FILE.read_bytes())
+        # Articles used to be keyed by a truncated MD5 of the raw href, which
+        # kept entities like &amp;; the extractor now yields decoded URLs
+        articles = {}
+        for article in state["articles"].values():
+            article["url"] = unescape(article["url"])
+            articles[article["url"]] = article
+        state["articles"] = articles
+    else:
+        state = {
+            "profiles": {},
+            "articles": {},
+            "comments_made": [],
+            "likes_made": [],
+            "last_run": None,
+            "comment_times": []
+        }
+    
+    if EVENTS_FILE.exists():
+        # Skip events already in the state (crash after the save, before the log was cleared)
+        recorded = {("like", e["url"], e["timestamp"]) for e in state["likes_made"]}
+        recorded.update(("comment", e["url"], e["timestamp"]) for e in state["comments_made"])
+        for line in EVENTS_FILE.read_bytes().splitlines():
+            if not line:
+                continue
+            event = loads(line)
+            key = (event["type"], event["url"], event["timestamp"])
+            if key not in recorded:
+                recorded.add(key)
+                apply_event(state, event)
+    return state
 
 
 def save_state(state: dict):
-    """Save engagement state."""
+    """Save engagement state and used delays, clearing the events it now includes."""
     DB_DIR.mkdir(parents=True, exist_ok=True)
-    STATE_FILE.write_text(json.dumps(state, indent=2, default=str))
+    STATE_FILE.write_bytes(dumps(state, indent=True))
+    EVENTS_FILE.unlink(missing_ok=True)
+    save_used_delays()
 
 
-def load_used_delays() -> set:
-    """Load previously used delay values to avoid repetition."""
-    if USED_DELAYS_FILE.exists():
-        data = json.loads(USED_DELAYS_FILE.read_text())
-        # Only keep delays from last 24h
-        cutoff = time.time() - 86400
-        return {d for d, ts in data.items() if ts > cutoff}
-    return set()
+def apply_event(state: dict, event: dict):
+    """Apply a like/comment event to state."""
+    article = state["articles"].get(event["url"])
+    if event["type"] == "like":
+        state["likes_made"].append({
+            "url": event["url"],
+            "timestamp": event["timestamp"]
+        })
+        if article:
+            article["liked"] = True
+    elif event["type"] == "comment":
+        state["comments_made"].append({
+            "url": event["url"],
+            "comment": event["comment"],
+            "timestamp": event["timestamp"]
+        })
+        if article:
+            article["commented"] = True
 
 
-def save_used_delay(delay_seconds: int):
-    """Save a used delay value."""
-    data = {}
-    if USED_DELAYS_FILE.exists():
-        data = json.loads(USED_DELAYS_FILE.read_text())
-    # Clean old entries
-    cutoff = time.time() - 86400
-    data = {k: v for k, v in data.items() if v > cutoff}
-    data[str(delay_seconds)] = time.time()
-    USED_DELAYS_FILE.write_text(json.dumps(data))
+def log_event(event: dict):
+    """Append an event to the events log so it survives a crash before the next state save."""
+    DB_DIR.mkdir(parents=True, exist_ok=True)
+    with EVENTS_FILE.open("ab") as f:
+        f.write(dumps(event) + b"\n")
+        f.flush()
+
+
+def load_used_delays() -> dict[int, float]:
+    """Load delays used in the last 24h, cached in memory for the session."""
+    global _USED_DELAYS, _USED_DELAYS_CUTOFF
+    if _USED_DELAYS is None:
+        # Epoch cutoff computed once per session; reused when saving
+        _USED_DELAYS_CUTOFF = time.time() - 86400
+        _USED_DELAYS = {}
+        if USED_DELAYS_FILE.exists():
+            data = loads(USED_DELAYS_FILE.read_bytes())
+            # Older files map str(delay) -> timestamp
+            entries = data["delays"] if "delays" in data else data.items()
+            _USED_DELAYS = {int(d): ts for d, ts in entries if ts > _USED_DELAYS_CUTOFF}
+    return _USED_DELAYS
+
+
+def save_used_delays():
+    """Write used delays from the last 24h as [[delay, timestamp], ...]."""
+    if _USED_DELAYS is None:
+        return
+    delays = [[d, ts] for d, ts in _USED_DELAYS.items() if ts > _USED_DELAYS_CUTOFF]
+    USED_DELAYS_FILE.write_bytes(dumps({"delays": delays}))
 
 
 def get_unique_delay() -> int:
@@ -87,8 +173,8 @@ def get_unique_delay() -> int:
         delay = random.randint(min_sec, max_sec)
         # Add some randomness to the seconds
         delay += random.randint(0, 59)
-        if str(delay) not in used:
-            save_used_delay(delay)
+        if delay not in used:
+            used[delay] = time.time()
             return delay
     
     # Fallback: just use a random delay
@@ -108,11 +194,10 @@ def merge_extracted_data(state: dict, extracted: dict) -> dict:
                 "engaged": False
             }
     
-    # Add articles
+    # Add articles (keyed by URL)
     for article in extracted.get("articles", []):
-        url_hash = hashlib.md5(article["url"].encode()).hexdigest()[:12]
-        if url_hash not in state["articles"]:
-            state["articles"][url_hash] = {
+        if article["url"] not in state["articles"]:
+            state["articles"][article["url"]] = {
                 "url": article["url"],
                 "title": article["title"],
                 "author_hint": article.get("author_hint", "unknown"),
@@ -126,14 +211,10 @@ def merge_extracted_data(state: dict, extracted: dict) -> dict:
 
 def get_pending_articles(state: dict, limit: int = 7) -> list:
     """Get articles that haven't been commented on yet."""
-    pending = []
-    for url_hash, article in state["articles"].items():
-        if not article.get("commented"):
-            pending.append({"hash": url_hash, **article})
+    pending = [a for a in state["articles"].values() if not a.get("commented")]
     
-    # Shuffle for variety
-    random.shuffle(pending)
-    return pending[:limit]
+    # Random pick for variety; only the sampled articles are copied
+    return [dict(a) for a in random.sample(pending, min(limit, len(pending)))]
 
 
 async def human_delay(min_sec: float = 1.0, max_sec: float = 3.0):
@@ -146,8 +227,8 @@ async def simulate_reading(page, seconds: float = None):
     if seconds is None:
         seconds = random.uniform(5, 15)
     
-    end_time = time.time() + seconds
-    while time.time() < end_time:
+    end_time = time.monotonic() + seconds
+    while time.monotonic() < end_time:
         # Small scroll
         scroll_amount = random.randint(100, 300)
         await page.evaluate(f"window.scrollBy(0, {scroll_amount})")
@@ -206,29 +287,18 @@ async def engage_with_article(page, article: dict, comment_text: str) -> dict:
         # Find comment box and post
         print("  → Looking for comment box...")
         
-        # Try different selectors for comment input
-        comment_selectors = [
-            'div[data-placeholder="Add a comment…"]',
-            'div.ql-editor[contenteditable="true"]',
-            'div[role="textbox"][aria-label*="comment"]',
-            '.comments-comment-box__form textarea',
-            '.comments-comment-texteditor'
-        ]
-        
-        comment_box = None
-        for selector in comment_selectors:
-            comment_box = await page.query_selector(selector)
-            if comment_box:
-                break
+        # One query for all known comment input variants
+        comment_box = await page.query_selector(COMMENT_BOX_SELECTOR)
         
         if comment_box:
             await comment_box.click()
             await human_delay(0.5, 1)
             
-            # Type comment slowly (human-like)
-            for char in comment_text:
-                await page.keyboard.type(char)
-                await asyncio.sleep(random.uniform(0.03, 0.12))
+            # Type comment word by word (human-like cadence, one keyboard call per word)
+            words = comment_text.split()
+            for i, word in enumerate(words):
+                await page.keyboard.type(word if i == len(words) - 1 else word + " ")
+                await asyncio.sleep(random.uniform(0.15, 0.6))
             
             await human_delay(1, 2)
             
@@ -354,13 +424,12 @@ async def run_engagement_session(
         print(f"✓ Saved HTML: {html_file.name}")
         
         # 3. Extract data (reuse existing extractor)
-        from extract_linkedin import extract_posts, dedupe_articles
+        from extract_linkedin import extract_posts
         extracted = extract_posts(html)
-        extracted["articles"] = dedupe_articles(extracted["articles"])
         
         # Save extracted data
         extracted_file = SCRAPED_DIR / f"extracted_{query}_{timestamp}.json"
-        extracted_file.write_text(json.dumps(extracted, indent=2))
+        extracted_file.write_bytes(dumps(extracted, indent=True))
         print(f"✓ Extracted: {len(extracted['articles'])} articles, {len(extracted['profiles'])} profiles")
         
         # 4. Merge into state
@@ -397,26 +466,26 @@ async def run_engagement_session(
             # Engage
             result = await engage_with_article(page, article, comment)
             
-            # Update state
+            # Update state (persisted to the events log, saved in full at session end)
             if result["liked"]:
-                state["likes_made"].append({
+                event = {
+                    "type": "like",
                     "url": article["url"],
                     "timestamp": datetime.now().isoformat()
-                })
+                }
+                apply_event(state, event)
+                log_event(event)
             
             if result["commented"]:
                 comments_made += 1
-                state["comments_made"].append({
+                event = {
+                    "type": "comment",
                     "url": article["url"],
                     "comment": comment,
                     "timestamp": datetime.now().isoformat()
-                })
-                state["articles"][article["hash"]]["commented"] = True
-            
-            if result["liked"]:
-                state["articles"][article["hash"]]["liked"] = True
-            
-            save_state(state)
+                }
+                apply_event(state, event)
+                log_event(event)
             
             # Wait before next comment (human-like delay)
             if i < len(pending) - 1 and comments_made < max_comments:
@@ -424,6 +493,8 @@ async def run_engagement_session(
                 print(f"\n⏳ Waiting {delay//60}m {delay%60}s before next engagement...")
                 await asyncio.sleep(delay)
         
+        save_state(state)
+        
         print(f"\n{'='*60}")
         print(f"Session complete!")
         print(f"  Comments made: {comments_made}")
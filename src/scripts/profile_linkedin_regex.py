@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Profile the extractor regexes against a saved LinkedIn page.
+
+For each compiled pattern in extract_linkedin, time it the way the extractor
+uses it, then replace each group / character class with a sentinel and
+re-time. A fragment that costs most of the time but barely changes the match
+count is a candidate for rewriting.
+
+_PROFILE_LINK_RE is scanned over the whole page with finditer.
+_PROFILE_NAME_RE is only used as an anchored match on the window after each
+profile link, so that is how it is measured.
+
+Usage: python profile_linkedin_regex.py [page.html]
+"""
+
+import re
+import sys
+import time
+from pathlib import Path
+
+import extract_linkedin
+
+SENTINEL = "foobar123"
+QUANTIFIER = re.compile(r'(?:[*+?]|\{\d+(?:,\d*)?\})\??')
+
+
+def fragments(pattern: str, start: int = 0, end: int = None) -> list[tuple[int, int]]:
+    """Return (start, end) spans of groups and character classes, nested ones included."""
+    end = len(pattern) if end is None else end
+    spans = []
+    i = start
+    while i < end:
+        char = pattern[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char in "([":
+            fragment_start, depth = i, 0
+            while i < end:
+                if pattern[i] == "\\":
+                    i += 2
+                    continue
+                if char == "[" and pattern[i] == "]" and i > fragment_start + 1:
+                    break
+                if char == "(":
+                    depth += {"(": 1, ")": -1}.get(pattern[i], 0)
+                    if depth == 0:
+                        break
+                i += 1
+            body_end = i
+            i += 1
+            quantifier = QUANTIFIER.match(pattern, i)
+            if quantifier:
+                i = quantifier.end()
+            spans.append((fragment_start, i))
+            if char == "(":
+                body_start = fragment_start + 1
+                if pattern.startswith("?:", body_start):
+                    body_start += 2
+                spans.extend(fragments(pattern, body_start, body_end))
+            continue
+        i += 1
+    return spans
+
+
+def measure(regex, html: str, windows: list[str] = None) -> tuple[float, int]:
+    """Time one pass, returning (seconds, match count).
+
+    Without windows the pattern is scanned over the page with finditer;
+    with windows it is matched at the start of each one.
+    """
+    start = time.perf_counter()
+    if windows is None:
+        count = sum(1 for _ in regex.finditer(html))
+    else:
+        count = sum(1 for window in windows if regex.match(window))
+    return time.perf_counter() - start, count
+
+
+def profile(name: str, regex, html: str, windows: list[str] = None):
+    base_time, base_count = measure(regex, html, windows)
+    print(f"\n{name}: {base_time * 1000:.2f} ms, {base_count} matches")
+    print(f"  {regex.pattern}")
+    for start, end in fragments(regex.pattern):
+        variant = regex.pattern[:start] + SENTINEL + regex.pattern[end:]
+        try:
+            # Same engine as the extractor (re2 when installed)
+            variant_re = extract_linkedin.re.compile(variant)
+        except extract_linkedin.re.error:
+            continue
+        variant_time, variant_count = measure(variant_re, html, windows)
+        saved = 1 - variant_time / base_time if base_time else 0
+        print(f"  {regex.pattern[start:end]:<30} time -{saved:6.1%}  matches {variant_count}")
+
+
+if __name__ == "__main__":
+    html_file = Path(sys.argv[1]) if len(sys.argv) > 1 else extract_linkedin.HTML_FILE
+    html = html_file.read_text(encoding="utf-8")
+    print(f"Profiling {html_file} ({len(html)} chars)")
+
+    # Same slices extract_author_profiles matches _PROFILE_NAME_RE against
+    name_windows = [
+        html[m.end():m.end() + extract_linkedin.PROFILE_NAME_WINDOW]
+        for m in extract_linkedin._PROFILE_LINK_RE.finditer(html)
+    ]
+    profile("_PROFILE_LINK_RE", extract_linkedin._PROFILE_LINK_RE, html)
+    profile("_PROFILE_NAME_RE", extract_linkedin._PROFILE_NAME_RE, html, name_windows)
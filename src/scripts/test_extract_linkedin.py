@@ -0,0 +1,53 @@
+"""Regression checks for extract_linkedin. Run with: python -m pytest src/scripts"""
+
+from pathlib import Path
+
+from extract_linkedin import extract_posts, extract_posts_from_file
+
+PULSE = "https://www.linkedin.com/pulse/"
+
+
+def test_titleless_pulse_anchor_does_not_claim_later_title():
+    html = (
+        f'<a href="{PULSE}img-only-a-b-1/"><img src="x.png"></a>'
+        + '<div class="filler">' + "x" * 10240 + "</div>"
+        + f'<a href="{PULSE}real-post-c-d-2/"><p>Real post title</p></a>'
+    )
+    articles = extract_posts(html)["articles"]
+    assert [(a["slug"], a["title"]) for a in articles] == [
+        ("real-post-c-d-2/", "Real post title")
+    ]
+
+
+def test_titleless_pulse_anchor_expires_after_window():
+    html = (
+        f'<a href="{PULSE}img-only-a-b-1/"><img src="x.png"></a>'
+        + '<div class="filler">' + "x" * 10240 + "</div>"
+        + "<p>Unrelated paragraph text</p>"
+    )
+    assert extract_posts(html)["articles"] == []
+
+
+def test_title_after_anchor_within_window():
+    html = (
+        f'<a href="{PULSE}openclaw-guide-jane-doe-1"><img src="x.png"></a>'
+        + '<div><p class="title">OpenClaw guide</p></div>'
+    )
+    articles = extract_posts(html)["articles"]
+    assert [a["title"] for a in articles] == ["OpenClaw guide"]
+
+
+def test_hashtags_found_outside_hrefs():
+    html = (
+        '<a href="/search/results/all/?keywords=%23OpenClaw">#openclaw</a>'
+        '<code>{"url":"/search/results/all/?keywords=%23moltbot&amp;origin=x"}</code>'
+        '<script>var u = "keywords=%23clawdbot";</script>'
+    )
+    assert sorted(extract_posts(html)["hashtags"]) == ["OpenClaw", "clawdbot", "moltbot"]
+
+
+def test_hashtag_split_across_chunks(tmp_path: Path):
+    page = tmp_path / "page.html"
+    page.write_text('<div>' + "x" * 60 + '<a href="?keywords=%23moltbot">m</a></div>')
+    for chunk_size in (1, 7, 64, 70):
+        assert extract_posts_from_file(page, chunk_size)["hashtags"] == ["moltbot"]
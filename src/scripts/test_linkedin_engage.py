@@ -0,0 +1,107 @@
+"""Regression checks for linkedin_engage state handling. Run with: python -m pytest src/scripts"""
+
+import json
+import time
+
+import pytest
+
+import linkedin_engage
+from extract_linkedin import extract_posts
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Point the state files at a temporary directory."""
+    monkeypatch.setattr(linkedin_engage, "DB_DIR", tmp_path)
+    monkeypatch.setattr(linkedin_engage, "STATE_FILE", tmp_path / "linkedin_state.json")
+    monkeypatch.setattr(linkedin_engage, "EVENTS_FILE", tmp_path / "linkedin_events.jsonl")
+    monkeypatch.setattr(linkedin_engage, "USED_DELAYS_FILE", tmp_path / "used_delays.json")
+    monkeypatch.setattr(linkedin_engage, "_USED_DELAYS", None)
+    return tmp_path
+
+
+def test_md5_keyed_state_with_escaped_url_matches_reextracted_article(db):
+    raw_url = "https://www.linkedin.com/pulse/x-a-b-1?trk=x&amp;y=z"
+    linkedin_engage.STATE_FILE.write_text(json.dumps({
+        "profiles": {},
+        "articles": {
+            "0123456789ab": {"url": raw_url, "title": "Some article", "commented": True}
+        },
+        "comments_made": [],
+        "likes_made": [],
+        "last_run": None,
+        "comment_times": []
+    }))
+    extracted = extract_posts(f'<a href="{raw_url}"><p>Some article</p></a>')
+
+    state = linkedin_engage.merge_extracted_data(linkedin_engage.load_state(), extracted)
+
+    assert list(state["articles"]) == ["https://www.linkedin.com/pulse/x-a-b-1?trk=x&y=z"]
+    assert linkedin_engage.get_pending_articles(state) == []
+
+
+def _seed_state():
+    state = linkedin_engage.load_state()
+    extracted = {"articles": [{"url": "https://www.linkedin.com/pulse/a-b-c-1", "title": "An article"}]}
+    state = linkedin_engage.merge_extracted_data(state, extracted)
+    linkedin_engage.save_state(state)
+    return state
+
+
+LIKE = {"type": "like", "url": "https://www.linkedin.com/pulse/a-b-c-1", "timestamp": "2026-10-15T10:00:00"}
+COMMENT = {
+    "type": "comment",
+    "url": "https://www.linkedin.com/pulse/a-b-c-1",
+    "comment": "Nice",
+    "timestamp": "2026-10-15T10:01:00"
+}
+
+
+def test_events_logged_after_save_are_replayed_once(db):
+    _seed_state()
+    linkedin_engage.log_event(LIKE)
+
+    state = linkedin_engage.load_state()
+    assert state["likes_made"] == [{"url": LIKE["url"], "timestamp": LIKE["timestamp"]}]
+
+    linkedin_engage.save_state(state)
+    assert not linkedin_engage.EVENTS_FILE.exists()
+    assert len(linkedin_engage.load_state()["likes_made"]) == 1
+
+
+def test_state_saved_without_clearing_log_is_not_duplicated(db):
+    state = _seed_state()
+    for event in (LIKE, COMMENT):
+        linkedin_engage.apply_event(state, event)
+        linkedin_engage.log_event(event)
+    # Crash between writing the state and unlinking the events log
+    linkedin_engage.STATE_FILE.write_bytes(linkedin_engage.dumps(state, indent=True))
+
+    state = linkedin_engage.load_state()
+    assert len(state["likes_made"]) == 1
+    assert len(state["comments_made"]) == 1
+
+
+def test_replayed_comment_marks_article_commented(db):
+    _seed_state()
+    linkedin_engage.log_event(COMMENT)
+
+    state = linkedin_engage.load_state()
+    assert state["articles"][COMMENT["url"]]["commented"] is True
+    assert linkedin_engage.get_pending_articles(state) == []
+
+
+def test_used_delays_convert_legacy_format_and_flush_with_state(db, monkeypatch):
+    now = time.time()
+    linkedin_engage.USED_DELAYS_FILE.write_text(json.dumps({"700": now, "800": now - 90000}))
+
+    assert linkedin_engage.load_used_delays() == {700: now}
+
+    monkeypatch.setattr(linkedin_engage.random, "randint", lambda a, b: 900 if b > 59 else 5)
+    assert linkedin_engage.get_unique_delay() == 905
+    assert json.loads(linkedin_engage.USED_DELAYS_FILE.read_text()) == {"700": now, "800": now - 90000}
+
+    linkedin_engage.save_state(linkedin_engage.load_state())
+    delays = json.loads(linkedin_engage.USED_DELAYS_FILE.read_text())["delays"]
+    assert [d for d, _ in delays] == [700, 905]
+    assert delays[0][1] == now